@@ -1,26 +1,39 @@
 import argparse
+import multiprocessing.util
 import os
 import re
 import sys
-import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from itertools import islice
 from typing import List, Dict, Optional
 
-from openpyxl import Workbook
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
+import xlsxwriter
+from lxml import etree, html as lxml_html
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
+# EXTRACT_VERBOSE=1 muestra el detalle por bloque (título, lookahead, filas)
+VERBOSE = os.environ.get("EXTRACT_VERBOSE") == "1"
+
+
 # ----------------------------
 # Utils
 # ----------------------------
 
+# "1,234", "1,234.5", "-12", "3.14": miles con coma opcionales + decimal opcional
+_NUMBER_RE = re.compile(r"-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?")
+
+
 def parse_number(value: str):
     """Convierte strings numéricos comunes a int/float cuando aplica."""
     if not isinstance(value, str):
@@ -29,234 +42,412 @@ def parse_number(value: str):
     if not v:
         return v
 
-    if re.fullmatch(r"-?\d{1,3}(,\d{3})+(\.\d+)?", v):
-        v2 = v.replace(",", "")
-        return float(v2) if "." in v2 else int(v2)
-
-    if re.fullmatch(r"-?\d+", v):
-        return int(v)
-
-    if re.fullmatch(r"-?\d+\.\d+", v):
-        return float(v)
-
-    return value
-
+    # la mayoría de celdas son texto: descartarlas sin entrar al regex
+    if v[0] not in "-0123456789" or not _NUMBER_RE.fullmatch(v):
+        return value
 
-def is_title_text(txt: str) -> bool:
-    return bool(txt and "User Selects" in txt)
+    if "," in v:
+        v = v.replace(",", "")
+    return float(v) if "." in v else int(v)
 
 
-def get_title_from_command_result(cr_element) -> Optional[str]:
+def numeric_columns(rows: List[List[str]], n_cols: int, sample_size: int = 10) -> List[bool]:
     """
-    Extrae el texto del título desde un WebElement (CommandResult).
-    Busca:
-      - div[data-testid="ansi-output"] div.ansiout
-      - cualquier elemento con class que contenga 'ansiout'
-      - texto que contenga "User Selects"
+    Marca qué columnas son numéricas mirando hasta sample_size valores no
+    vacíos de cada una. Las que no tienen ningún número en la muestra se
+    escriben como texto sin pasar por parse_number.
     """
-    try:
-        # 1) ansi-output -> ansiout
-        ansi_outputs = cr_element.find_elements(By.CSS_SELECTOR, 'div[data-testid="ansi-output"]')
-        for ao in ansi_outputs:
-            ansiouts = ao.find_elements(By.CSS_SELECTOR, 'div.ansiout')
-            for a in ansiouts:
-                txt = (a.text or "").strip()
-                if is_title_text(txt):
-                    return txt
-                if txt:  # a veces el título no contiene exactamente "User Selects" pero igual te sirve
-                    # si quieres forzar solo User Selects, comenta esta línea:
-                    if "User Selects" in txt:
-                        return txt
-
-        # 2) cualquier div.ansiout directo
-        ansiouts = cr_element.find_elements(By.CSS_SELECTOR, 'div.ansiout')
-        for a in ansiouts:
-            txt = (a.text or "").strip()
-            if is_title_text(txt):
-                return txt
-            if txt and "User Selects" in txt:
-                return txt
-
-        # 3) fallback: buscar cualquier nodo con texto que contenga User Selects
-        # (Selenium no tiene "contains text" fácil sin XPath)
-        nodes = cr_element.find_elements(By.XPATH, ".//*[contains(normalize-space(text()), 'User Selects')]")
-        for n in nodes:
-            txt = (n.text or "").strip()
-            if is_title_text(txt):
-                return txt
+    flags = []
+    for col_idx in range(n_cols):
+        samples = islice((r[col_idx] for r in rows if r[col_idx]), sample_size)
+        flags.append(any(not isinstance(parse_number(v), str) for v in samples))
+    return flags
+
+
+# Título + "tiene tabla" de todos los CommandResult en un solo round-trip.
+#   - título: primer div.ansiout (incluye los de ansi-output) cuyo texto
+#     contenga "User Selects"; fallback: cualquier nodo con ese texto
+#   - tabla: class contiene 'command-result-tabs' o existe datagrid.table
+#   - element: referencia al nodo (solo bloques con tabla, los únicos que se
+#     scrollean/leen después); así metadata y elementos salen del mismo snapshot
+_BLOCKS_METADATA_JS = """
+const MARK = 'User Selects';
+const titleOf = (cr) => {
+  for (const a of cr.querySelectorAll('div.ansiout')) {
+    const t = a.innerText.trim();
+    if (t.includes(MARK)) return t;
+  }
+  const walker = document.createTreeWalker(cr, NodeFilter.SHOW_TEXT);
+  for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+    if (!n.nodeValue.includes(MARK) || !n.parentElement) continue;
+    const t = n.parentElement.innerText.trim();
+    if (t.includes(MARK)) return t;
+  }
+  return null;
+};
+return [...document.querySelectorAll('div[data-testid="CommandResult"]')].map((cr, idx) => {
+  const hasTable = (cr.getAttribute('class') || '').includes('command-result-tabs')
+    || !!cr.querySelector('div[data-testid="datagrid.table"]');
+  return {idx: idx, title: titleOf(cr), hasTable: hasTable, element: hasTable ? cr : null};
+});
+"""
+
+
+def extract_all_blocks_metadata(driver) -> List[Dict]:
+    """
+    Devuelve [{idx, title, hasTable, element}, ...] para cada CommandResult,
+    en orden de documento. element es el WebElement (solo si hasTable).
+    """
+    return driver.execute_script(_BLOCKS_METADATA_JS) or []
 
-    except Exception:
-        pass
 
-    return None
+# Re-resuelve el CommandResult arguments[0] solo si el DOM sigue alineado con
+# el snapshot: misma cantidad de bloques (arguments[1]) y el nodo todavía tiene
+# tabla. Si no, null: mejor "no renderizó" que una tabla bajo otro título
+_BLOCK_AT_JS = """
+const all = document.querySelectorAll('div[data-testid="CommandResult"]');
+if (all.length !== arguments[1]) return null;
+const cr = all[arguments[0]];
+if (!cr) return null;
+const hasTable = (cr.getAttribute('class') || '').includes('command-result-tabs')
+  || !!cr.querySelector('div[data-testid="datagrid.table"]');
+return hasTable ? cr : null;
+"""
 
 
-def has_table_structure(cr_element) -> bool:
+def scroll_to_block(driver, meta: List[Dict], k: int):
     """
-    Detecta si el CommandResult parece contener una tabla.
-    - class contiene 'command-result-tabs' OR
-    - existe div[data-testid="datagrid.table"]
+    Scrollea al CommandResult meta[k] y devuelve su WebElement. Si la
+    referencia quedó stale (la página re-renderizó la sección), la vuelve
+    a resolver por índice una vez, solo si la página sigue teniendo los
+    mismos bloques. Devuelve None si no se puede asegurar que es el mismo.
     """
+    scroll_js = "arguments[0].scrollIntoView({block:'center'});"
+    block = meta[k]["element"]
+    if block is None:
+        # ya se intentó re-resolver antes (otro título apunta al mismo bloque)
+        return None
     try:
-        classes = (cr_element.get_attribute("class") or "")
-        if "command-result-tabs" in classes:
-            return True
-        tables = cr_element.find_elements(By.CSS_SELECTOR, 'div[data-testid="datagrid.table"]')
-        return len(tables) > 0
-    except Exception:
-        return False
-
-
-def wait_table_rendered(wait: WebDriverWait, cr_element, timeout_sec: int = 6) -> bool:
+        driver.execute_script(scroll_js, block)
+    except StaleElementReferenceException:
+        try:
+            block = driver.execute_script(_BLOCK_AT_JS, k, len(meta))
+            meta[k]["element"] = block
+            if block is None:
+                return None
+            driver.execute_script(scroll_js, block)
+        except WebDriverException:
+            return None
+    except WebDriverException:
+        return None
+    return block
+
+
+# Espera por eventos (MutationObserver) a que dentro del CommandResult exista
+# datagrid.table + datagrid.grid.right + al menos 1 header; responde apenas
+# aparecen, sin granularidad de polling
+_WAIT_TABLE_RENDERED_JS = """
+const root = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const ready = () => {
+  if (!root.querySelector('div[data-testid="datagrid.table"]')) return false;
+  const g = root.querySelector('div[data-testid="datagrid.grid.right"]');
+  return !!g && !!g.querySelector('div[role="columnheader"]');
+};
+if (ready()) { done(true); return; }
+
+let timer = null;
+const obs = new MutationObserver(() => {
+  if (!ready()) return;
+  obs.disconnect();
+  clearTimeout(timer);
+  done(true);
+});
+obs.observe(root, {childList: true, subtree: true});
+timer = setTimeout(() => { obs.disconnect(); done(false); }, timeoutMs);
+"""
+
+
+def wait_table_rendered(driver, cr_element, timeout_sec: int = 6) -> bool:
     """
     Espera a que dentro del CommandResult exista:
       - datagrid.table
       - datagrid.grid.right
       - al menos 1 header
+    (timeout_sec debe quedar por debajo del script timeout del driver, 30s)
     """
-    end = time.time() + timeout_sec
-    while time.time() < end:
-        try:
-            datagrid = cr_element.find_elements(By.CSS_SELECTOR, 'div[data-testid="datagrid.table"]')
-            if not datagrid:
-                time.sleep(0.2)
-                continue
+    try:
+        return bool(driver.execute_async_script(_WAIT_TABLE_RENDERED_JS, cr_element, timeout_sec * 1000))
+    except WebDriverException:
+        return False
 
-            grid_right = cr_element.find_elements(By.CSS_SELECTOR, 'div[data-testid="datagrid.grid.right"]')
-            if not grid_right:
-                time.sleep(0.2)
-                continue
 
-            headers = cr_element.find_elements(By.CSS_SELECTOR, 'div[data-testid="datagrid.grid.right"] div[role="columnheader"]')
-            if headers:
-                return True
-        except Exception:
-            pass
+def wait_scroll_settled(driver, element, timeout_sec: float = 2) -> None:
+    """Espera a que la posición del elemento deje de cambiar tras el scroll."""
+    last_top = [None]
 
-        time.sleep(0.2)
+    def settled(d):
+        top = d.execute_script("return arguments[0].getBoundingClientRect().top;", element)
+        done = top == last_top[0]
+        last_top[0] = top
+        return done
+
+    # si el probe falla (stale, error JS) se da por asentado: wait_table_rendered
+    # es el que decide y reporta si el bloque no está
+    try:
+        WebDriverWait(driver, timeout_sec, poll_frequency=0.05).until(settled)
+    except WebDriverException:
+        pass
 
-    return False
 
+def empty_table() -> Dict[str, List]:
+    return {"columns": [], "rows": []}
 
-def extract_table_data_from_element(cr_element) -> List[Dict[str, str]]:
+
+def parse_table_grid(grid, rendered: Optional[Dict] = None) -> Dict[str, List]:
     """
-    Extrae tabla DIRECTAMENTE desde Selenium WebElement.
-    Requisito: el bloque de tabla debe estar visible/renderizado.
+    Lee la tabla desde el elemento lxml de div[data-testid="datagrid.grid.right"].
+    Devuelve {"columns": [...], "rows": [[v, v, ...], ...]} (una lista por fila,
+    alineada con columns):
+      - el texto de headers/celdas sale de rendered ({elemento lxml: innerText},
+        lo arma el camino con navegador); sin rendered (camino estático) se usa
+        text_content(), que incluye texto oculto y no convierte <br> en saltos
+      - se ignora la header-row y la columna #row_number#
+      - la columna sale de data-cell-id ("13_account", "13_Avg Sales", etc);
+        si no trae "_", por posición (último recurso)
+      - solo quedan las columnas y filas con algún valor; las columnas van en
+        orden de primera aparición recorriendo las filas (unión ordenada)
     """
-    table_data: List[Dict[str, str]] = []
+    def text_of(el) -> str:
+        txt = rendered.get(el) if rendered is not None else None
+        return (txt if txt is not None else el.text_content()).strip()
 
-    # datagrid + grid right
-    datagrid = cr_element.find_element(By.CSS_SELECTOR, 'div[data-testid="datagrid.table"]')
-    grid_right = datagrid.find_element(By.CSS_SELECTOR, 'div[data-testid="datagrid.grid.right"]')
-
-    # headers
     headers = []
-    header_elements = grid_right.find_elements(By.CSS_SELECTOR, 'div[role="columnheader"]')
-    for h in header_elements:
-        txt = (h.text or "").strip()
+    for h in grid.xpath('.//div[@role="columnheader"]'):
+        txt = text_of(h)
         if txt and txt != "#row_number#":
             headers.append(txt)
+    header_set = set(headers)
 
-    if not headers:
-        return table_data
-
-    # rows (solo lo visible; en estos HTML exportados normalmente basta)
-    row_elements = grid_right.find_elements(By.CSS_SELECTOR, 'div[role="row"]')
-    for row in row_elements:
-        # saltar header-row
-        if row.find_elements(By.CSS_SELECTOR, 'div[role="columnheader"]'):
-            continue
-
-        cells = row.find_elements(By.CSS_SELECTOR, 'div[role="cell"]')
-        if not cells:
-            continue
-
+    by_row = []
+    for row in grid.xpath('.//div[@role="row"][not(.//div[@role="columnheader"])]'):
         row_data = {}
-        for cell in cells:
-            cell_id = (cell.get_attribute("data-cell-id") or "").strip()
-            value = (cell.text or "").strip()
+        for cell_idx, cell in enumerate(row.xpath('.//div[@role="cell"]')):
+            value = text_of(cell)
             if not value:
                 continue
 
-            # cell_id suele ser "13_account", "13_Avg Sales", etc
-            col_name = None
-            if "_" in cell_id:
-                _, col_name = cell_id.split("_", 1)
-            else:
-                # fallback por posición
-                col_name = None
+            _, sep, col_name = (cell.get("data-cell-id") or "").strip().partition("_")
+            if not sep:
+                col_name = headers[cell_idx] if cell_idx < len(headers) else None
 
-            if col_name and col_name in headers:
+            if col_name and col_name in header_set:
                 row_data[col_name] = value
-            elif col_name is None:
-                # fallback por índice (último recurso)
-                idx = cells.index(cell)
-                if idx < len(headers):
-                    row_data[headers[idx]] = value
 
         if row_data:
-            table_data.append(row_data)
+            by_row.append(row_data)
+
+    columns = list(dict.fromkeys(col_name for r in by_row for col_name in r))
+    return {"columns": columns, "rows": [[r.get(c, "") for c in columns] for r in by_row]}
 
-    return table_data
+
+# outerHTML de la grilla + innerText de cada header/celda en orden de documento
+# (el mismo orden en que lxml devuelve .//div[@role="columnheader" or @role="cell"]),
+# para conservar el texto tal como se ve en pantalla
+_GRID_HTML_JS = """
+const g = arguments[0].querySelector(
+  'div[data-testid="datagrid.table"] div[data-testid="datagrid.grid.right"]');
+if (!g) return null;
+const texts = [...g.querySelectorAll('div[role="columnheader"], div[role="cell"]')]
+  .map((el) => el.innerText);
+return {html: g.outerHTML, texts: texts};
+"""
+
+
+def extract_table_data_from_element(driver, cr_element) -> Dict[str, List]:
+    """
+    Extrae tabla desde el WebElement del CommandResult: un solo round-trip
+    para traer el outerHTML de la grilla (con el innerText de headers y
+    celdas) y el resto se parsea local con lxml.
+    Requisito: el bloque de tabla debe estar visible/renderizado.
+    """
+    grid = driver.execute_script(_GRID_HTML_JS, cr_element)
+    if not grid:
+        return empty_table()
+
+    root = lxml_html.fromstring(grid["html"])
+    nodes = root.xpath('.//div[@role="columnheader" or @role="cell"]')
+    # si no calzan (no debería pasar) se cae a text_content()
+    rendered = dict(zip(nodes, grid["texts"])) if len(nodes) == len(grid["texts"]) else None
+    return parse_table_grid(root, rendered)
 
 
 # ----------------------------
 # Main extraction
 # ----------------------------
 
-def extract_titles_and_tables_live(driver, max_lookahead: int = 40) -> List[Dict]:
-    wait = WebDriverWait(driver, 12)
+def find_table_index(meta: List[Dict], i: int, max_lookahead: int) -> Optional[int]:
+    """
+    Índice del primer bloque con tabla después del título meta[i], mirando
+    hasta max_lookahead bloques. Corta si aparece otro título antes.
+    """
+    title = meta[i]["title"]
+    for j in range(1, max_lookahead + 1):
+        k = i + j
+        if k >= len(meta):
+            break
+
+        # si aparece otro título antes de tabla, cortamos
+        cand_title = meta[k]["title"]
+        if cand_title and cand_title != title:
+            if VERBOSE:
+                print(f"    [STOP] Next title reached before table (lookahead #{j}).")
+            break
+
+        if meta[k]["hasTable"]:
+            if VERBOSE:
+                print(f"    [OK] Table structure found at lookahead #{j}.")
+            return k
+
+    return None
 
-    # obtener todos los CommandResult
-    command_results = driver.find_elements(By.CSS_SELECTOR, 'div[data-testid="CommandResult"]')
-    print(f"[INFO] CommandResult blocks: {len(command_results)}")
+
+def extract_titles_and_tables_live(driver, max_lookahead: int = 40) -> List[Dict]:
+    # todos los CommandResult: metadata (título / tabla) + elementos en batch
+    meta = extract_all_blocks_metadata(driver)
+    print(f"[INFO] CommandResult blocks: {len(meta)}")
 
     results = []
 
-    for idx, cr in enumerate(command_results, start=1):
-        title = get_title_from_command_result(cr)
+    # después del último título no queda nada que emparejar
+    last_title = max((i for i, m in enumerate(meta) if m["title"]), default=-1)
+
+    for i, m in enumerate(meta[:last_title + 1]):
+        title = m["title"]
         if not title:
             continue
+        idx = i + 1
 
-        print(f"\n[{idx}] TITLE: {title}")
+        if VERBOSE:
+            print(f"\n[{idx}] TITLE: {title}")
 
         # buscar el siguiente CommandResult que tenga estructura de tabla
-        table_data = []
-        found_table_block = None
-
-        for j in range(1, max_lookahead + 1):
-            if idx - 1 + j >= len(command_results):
-                break
-            cand = command_results[idx - 1 + j]
+        # (solo sobre la metadata: cero round-trips en el lookahead)
+        table_data = empty_table()
+        table_idx = find_table_index(meta, i, max_lookahead)
 
-            # si aparece otro título antes de tabla, cortamos
-            cand_title = get_title_from_command_result(cand)
-            if cand_title and cand_title != title:
-                print(f"    [STOP] Next title reached before table (lookahead #{j}).")
-                break
-
-            if has_table_structure(cand):
-                found_table_block = cand
-                print(f"    [OK] Table structure found at lookahead #{j}.")
-                break
-
-        if found_table_block is not None:
+        if table_idx is not None:
             # scrollear y esperar renderizado
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", found_table_block)
-            time.sleep(0.6)
-
-            rendered = wait_table_rendered(wait, found_table_block, timeout_sec=8)
+            found_table_block = scroll_to_block(driver, meta, table_idx)
+            if found_table_block is not None:
+                wait_scroll_settled(driver, found_table_block)
+
+            rendered = (
+                found_table_block is not None
+                and wait_table_rendered(driver, found_table_block, timeout_sec=8)
+            )
             if not rendered:
-                print("    [WARN] Table did not render (virtualized / not loaded).")
+                print(f"    [WARN] [{idx}] Table did not render (virtualized / not loaded).")
             else:
                 try:
-                    table_data = extract_table_data_from_element(found_table_block)
-                    print(f"    [OK] Rows extracted: {len(table_data)}")
+                    table_data = extract_table_data_from_element(driver, found_table_block)
+                    if VERBOSE:
+                        print(f"    [OK] Rows extracted: {len(table_data['rows'])}")
                 except Exception as e:
-                    print(f"    [ERROR] Extract table failed: {e}")
+                    print(f"    [ERROR] [{idx}] Extract table failed: {e}")
 
         results.append({"title": title, "table_data": table_data})
 
+    print_summary(results)
+
+    return results
+
+
+def print_summary(results: List[Dict]):
+    with_table = sum(1 for r in results if r["table_data"]["rows"])
+    total_rows = sum(len(r["table_data"]["rows"]) for r in results)
+    print(f"[INFO] Titles: {len(results)} | with table: {with_table} | rows: {total_rows}")
+
+
+# ----------------------------
+# Sin navegador (HTML estático)
+# ----------------------------
+
+def get_title_from_lxml(cr) -> Optional[str]:
+    """Mismo criterio de título que _BLOCKS_METADATA_JS, sobre un elemento lxml."""
+    ansiouts = cr.xpath(".//div[contains(concat(' ', normalize-space(@class), ' '), ' ansiout ')]")
+    for a in ansiouts:
+        txt = a.text_content().strip()
+        if "User Selects" in txt:
+            return txt
+
+    # fallback: cualquier nodo con texto que contenga User Selects
+    for n in cr.xpath(".//text()[contains(., 'User Selects')]/.."):
+        txt = n.text_content().strip()
+        if "User Selects" in txt:
+            return txt
+
+    return None
+
+
+def extract_blocks_metadata_static(doc) -> List[Dict]:
+    """Como extract_all_blocks_metadata, pero sobre el documento lxml."""
+    meta = []
+    for idx, cr in enumerate(doc.xpath('//div[@data-testid="CommandResult"]')):
+        has_table = (
+            "command-result-tabs" in (cr.get("class") or "")
+            or bool(cr.xpath('.//div[@data-testid="datagrid.table"]'))
+        )
+        meta.append({
+            "idx": idx,
+            "title": get_title_from_lxml(cr),
+            "hasTable": has_table,
+            "element": cr if has_table else None,
+        })
+    return meta
+
+
+def extract_titles_and_tables_static(html_file: str, max_lookahead: int = 40) -> Optional[List[Dict]]:
+    """
+    Extrae títulos y tablas parseando el archivo con lxml, sin Chrome.
+    Solo sirve si el HTML ya trae las tablas renderizadas; si no aparece
+    ninguna fila (o el archivo no se puede parsear) devuelve None para
+    que se use el navegador.
+    """
+    try:
+        doc = lxml_html.parse(html_file).getroot()
+    except etree.LxmlError:
+        return None
+    if doc is None:
+        # archivo vacío o que lxml no pudo interpretar
+        return None
+    meta = extract_blocks_metadata_static(doc)
+    print(f"[INFO] CommandResult blocks (static): {len(meta)}")
+
+    results = []
+    for i, m in enumerate(meta):
+        if not m["title"]:
+            continue
+
+        if VERBOSE:
+            print(f"\n[{i + 1}] TITLE: {m['title']}")
+
+        table_data = empty_table()
+        table_idx = find_table_index(meta, i, max_lookahead)
+        if table_idx is not None:
+            grids = meta[table_idx]["element"].xpath(
+                './/div[@data-testid="datagrid.table"]//div[@data-testid="datagrid.grid.right"]'
+            )
+            if grids:
+                table_data = parse_table_grid(grids[0])
+
+        results.append({"title": m["title"], "table_data": table_data})
+
+    if not any(r["table_data"]["rows"] for r in results):
+        return None
+
+    print_summary(results)
     return results
 
 
@@ -265,49 +456,46 @@ def extract_titles_and_tables_live(driver, max_lookahead: int = 40) -> List[Dict
 # ----------------------------
 
 def save_to_excel(results: List[Dict], output_file: str):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Results"
+    # constant_memory: cada fila se escribe directo al xlsx (en orden)
+    wb = xlsxwriter.Workbook(output_file, {"constant_memory": True})
+    ws = wb.add_worksheet("Results")
+    bold = wb.add_format({"bold": True})
+
+    # widths
+    max_col = max([1] + [len(item["table_data"]["columns"]) for item in results])
+    ws.set_column(0, 0, 80)
+    if max_col > 1:
+        ws.set_column(1, max_col - 1, 24)
 
-    row = 1
+    row = 0
 
     for item in results:
-        title = item["title"]
         table = item["table_data"]
 
-        ws.cell(row=row, column=1, value=title).font = Font(bold=True)
+        ws.write_string(row, 0, item["title"], bold)
         row += 1
 
-        if table:
-            # columnas: unión ordenada
-            columns = []
-            seen = set()
-            for r in table:
-                for k in r.keys():
-                    if k not in seen:
-                        seen.add(k)
-                        columns.append(k)
-
+        if table["rows"]:
             # headers
-            for col_idx, col_name in enumerate(columns, start=1):
-                cell = ws.cell(row=row, column=col_idx, value=col_name)
-                cell.font = Font(bold=True)
+            for col_idx, col_name in enumerate(table["columns"]):
+                ws.write_string(row, col_idx, col_name, bold)
             row += 1
 
-            # data
-            for r in table:
-                for col_idx, col_name in enumerate(columns, start=1):
-                    v = r.get(col_name, "")
-                    ws.cell(row=row, column=col_idx, value=parse_number(v))
+            # data: cada fila ya viene alineada con las columnas
+            is_numeric = numeric_columns(table["rows"], len(table["columns"]))
+            for row_values in table["rows"]:
+                for col_idx, v in enumerate(row_values):
+                    if is_numeric[col_idx]:
+                        v = parse_number(v)
+                    if not isinstance(v, str):
+                        ws.write_number(row, col_idx, v)
+                    elif v:
+                        ws.write_string(row, col_idx, v)
                 row += 1
 
         row += 1  # blank line
 
-    # widths
-    for col_idx in range(1, ws.max_column + 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = 24 if col_idx > 1 else 80
-
-    wb.save(output_file)
+    wb.close()
     print(f"[OK] Excel saved: {output_file}")
 
 
@@ -315,12 +503,27 @@ def save_to_excel(results: List[Dict], output_file: str):
 # Selenium bootstrap
 # ----------------------------
 
-def create_driver():
+def create_driver(headless: bool = True):
     chrome_options = Options()
-    # chrome_options.add_argument("--headless=new")  # si quieres headless
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        # headless arranca en 800x600: la grilla virtualizada renderiza menos filas
+        chrome_options.add_argument("--window-size=1920,1080")
+    else:
+        chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--start-maximized")
+
+    # solo leemos el DOM: sin GPU, imágenes ni notificaciones
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+
+    # driver.get vuelve en DOMContentLoaded; open_local_html espera lo necesario
+    chrome_options.page_load_strategy = "eager"
 
     try:
         driver = webdriver.Chrome(options=chrome_options)
@@ -334,16 +537,98 @@ def create_driver():
         return driver
 
 
+_PAGE_READY_JS = (
+    "return document.readyState === 'complete' && "
+    "document.querySelectorAll('div[data-testid=\"CommandResult\"]').length > 0;"
+)
+
+
 def open_local_html(driver, html_file_path: str):
     abs_path = os.path.abspath(html_file_path)
     file_url = f"file:///{abs_path.replace(os.sep, '/')}"
     driver.get(file_url)
 
-    wait = WebDriverWait(driver, 15)
-    wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-    time.sleep(1.5)
+    # listo = load completo y los CommandResult ya están en el DOM
+    try:
+        WebDriverWait(driver, 15).until(lambda d: d.execute_script(_PAGE_READY_JS))
+    except TimeoutException:
+        # sin CommandResult (o muy lento): seguimos y la extracción lo reporta
+        pass
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(0.5)
+
+
+# ----------------------------
+# Batch
+# ----------------------------
+
+def extract_with_browser(driver, html_file: str) -> List[Dict]:
+    # cada archivo en una pestaña nueva del mismo Chrome: no se relanza el
+    # navegador y la página anterior se libera al cerrar su pestaña
+    base_handle = driver.current_window_handle
+    driver.switch_to.new_window("tab")
+    try:
+        open_local_html(driver, html_file)
+
+        # IMPORTANTE: NO hacemos scroll global para “renderizar todo”.
+        # Extraemos tabla por tabla cuando toca.
+        results = extract_titles_and_tables_live(driver, max_lookahead=40)
+    finally:
+        driver.close()
+        driver.switch_to.window(base_handle)
+
+    return results
+
+
+def process_file(get_driver, html_file: str, output_file: str, static_first: bool = False) -> str:
+    """
+    Procesa un HTML y guarda el Excel. get_driver() devuelve el Chrome a usar;
+    solo se llama si hace falta el navegador.
+    """
+    print(f"[INFO] Procesando archivo: {html_file}")
+
+    results = None
+    if static_first:
+        results = extract_titles_and_tables_static(html_file, max_lookahead=40)
+        if results is None:
+            print("[INFO] El HTML no trae las tablas renderizadas: se usa Chrome")
+
+    if results is None:
+        results = extract_with_browser(get_driver(), html_file)
+
+    save_to_excel(results, output_file)
+    return output_file
+
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+# driver propio de cada proceso del pool: se crea la primera vez que hace
+# falta y se reutiliza entre archivos
+_worker_driver = None
+_worker_headless = True
+
+
+def init_worker(headless: bool = True):
+    """Initializer del pool."""
+    global _worker_headless
+    _worker_headless = headless
+
+
+def get_worker_driver():
+    global _worker_driver
+    if _worker_driver is None:
+        _worker_driver = create_driver(headless=_worker_headless)
+        # los procesos del pool no corren atexit; Finalize sí se ejecuta al salir
+        multiprocessing.util.Finalize(None, quit_driver, args=(_worker_driver,), exitpriority=10)
+    return _worker_driver
+
+
+def process_file_in_worker(html_file: str, output_file: str, static_first: bool) -> str:
+    return process_file(get_worker_driver, html_file, output_file, static_first)
 
 
 # ----------------------------
@@ -355,39 +640,97 @@ if __name__ == "__main__":
         description="Extrae títulos y tablas de archivos HTML de Databricks y los exporta a Excel"
     )
     parser.add_argument(
-        "html_file",
+        "html_files",
         type=str,
-        help="Ruta al archivo HTML a procesar"
+        nargs="+",
+        metavar="html_file",
+        help="Ruta(s) al archivo HTML a procesar"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Procesos en paralelo, cada uno con su propio Chrome (default: 1)"
+    )
+    parser.add_argument(
+        "--show-browser",
+        action="store_true",
+        help="Abre Chrome con ventana (por defecto corre headless)"
+    )
+    parser.add_argument(
+        "--no-browser",
+        action="store_true",
+        help="Intenta primero leer el HTML con lxml, sin Chrome; si no trae tablas "
+             "renderizadas, usa Chrome igual"
     )
     
     args = parser.parse_args()
-    html_file = args.html_file
+    html_files = args.html_files
     
-    # Validar que el archivo existe
-    if not os.path.exists(html_file):
-        print(f"❌ Error: El archivo no existe: {html_file}")
-        sys.exit(1)
-    
-    # Validar que es un archivo HTML
-    if not html_file.lower().endswith(('.html', '.htm')):
-        print(f"❌ Advertencia: El archivo no parece ser HTML: {html_file}")
-    
-    print(f"[INFO] Procesando archivo: {html_file}")
-
-    driver = create_driver()
-    try:
-        open_local_html(driver, html_file)
+    for html_file in html_files:
+        # Validar que el archivo existe
+        if not os.path.exists(html_file):
+            print(f"❌ Error: El archivo no existe: {html_file}")
+            sys.exit(1)
+        
+        # Validar que es un archivo HTML
+        if not html_file.lower().endswith(('.html', '.htm')):
+            print(f"❌ Advertencia: El archivo no parece ser HTML: {html_file}")
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if len(html_files) == 1:
+        jobs = [(html_files[0], f"titulos_{ts}.xlsx")]
+    else:
+        # varios archivos en el mismo segundo: el nombre del HTML evita colisiones;
+        # si dos rutas tienen el mismo nombre (a/report.html, b/report.html) se
+        # agrega un contador para que no escriban el mismo Excel
+        jobs = []
+        used_names = set()
+        for f in html_files:
+            stem = os.path.splitext(os.path.basename(f))[0]
+            name, n = stem, 1
+            while name in used_names:
+                n += 1
+                name = f"{stem}-{n}"
+            used_names.add(name)
+            jobs.append((f, f"titulos_{name}_{ts}.xlsx"))
+
+    # un archivo que falla se reporta y se sigue con el resto (en ambos modos)
+    failed = 0
+    workers = max(1, min(args.workers, len(jobs)))
+    if workers == 1:
+        # Chrome se crea solo si algún archivo lo necesita
+        drivers = []
+
+        def get_driver():
+            if not drivers:
+                drivers.append(create_driver(headless=not args.show_browser))
+            return drivers[0]
 
-        # IMPORTANTE: NO hacemos scroll global para “renderizar todo”.
-        # Extraemos tabla por tabla cuando toca.
-        results = extract_titles_and_tables_live(driver, max_lookahead=40)
-
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        out = f"titulos_{ts}.xlsx"
-        save_to_excel(results, out)
-
-    finally:
         try:
-            driver.quit()
-        except:
-            pass
+            for html_file, out in jobs:
+                try:
+                    process_file(get_driver, html_file, out, args.no_browser)
+                except Exception as e:
+                    failed += 1
+                    print(f"[ERROR] {html_file}: {e}")
+        finally:
+            for driver in drivers:
+                quit_driver(driver)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(not args.show_browser,)
+        ) as executor:
+            futures = {
+                executor.submit(process_file_in_worker, f, out, args.no_browser): f
+                for f, out in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"[ERROR] {futures[future]}: {e}")
+
+    if failed:
+        sys.exit(1)